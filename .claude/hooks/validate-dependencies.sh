@@ -0,0 +1,5 @@
+#!/bin/bash
+# Check that the staged modules' dependencies exist and form no cycles.
+# Uses a running `module_daemon.py` when there is one, otherwise
+# builds the dependency graph in-process.
+exec python3 module_client.py dependencies "$@"
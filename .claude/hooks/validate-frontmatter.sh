@@ -0,0 +1,5 @@
+#!/bin/bash
+# Validate YAML frontmatter of the staged modules.
+# Uses a running `module_daemon.py` when there is one, otherwise
+# validates in-process.
+exec python3 module_client.py validate "$@"
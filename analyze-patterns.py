@@ -3,13 +3,181 @@
 Pattern Analysis Tool - Identifies common patterns in the codebase
 """
 
+import argparse
+import json
 import os
 import re
+import time
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 
+from pattern_stats import PatternStats
+from result_cache import ResultCache
+
+class PatternMatcher:
+    """Precompiled matcher for a ``{category: {name: regex}}`` pattern table.
+
+    ``scan`` returns one match list per pattern, in table order, identical to
+    running ``re.findall(regex, content, re.MULTILINE)`` for every pattern.
+
+    Two strategies are available:
+
+    - ``split``: one precompiled ``findall`` per pattern.
+    - ``combined``: a single scanner over the content. An alternation of all
+      patterns locates every position where at least one pattern can start,
+      and one anchored probe of per-pattern lookahead groups reports which
+      patterns match there. Each pattern keeps its own resume offset, so
+      overlapping matches from different patterns are all reported while
+      each pattern stays non-overlapping, exactly like ``findall``.
+      Patterns must not use backreferences.
+
+    ``combined`` is about half the speed of ``split`` on CPython: ``re``
+    cannot use its literal-prefix search on the merged alternation, so one
+    pass costs more than a prefix-optimised scan per pattern. ``split`` is
+    the default; use ``--benchmark`` to compare on your own tree.
+    """
+
+    STRATEGIES = ('split', 'combined')
+
+    def __init__(self, patterns, strategy='split'):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.strategy = strategy
+        self.entries = []
+        self.compiled = []
+        for category, group in patterns.items():
+            for name, regex in group.items():
+                self.entries.append((category, name))
+                self.compiled.append(re.compile(regex, re.MULTILINE))
+
+        regexes = [rx.pattern for rx in self.compiled]
+        self._gate = re.compile(
+            '|'.join(f'(?:{regex})' for regex in regexes), re.MULTILINE)
+        self._probe = re.compile(
+            ''.join(f'(?:(?=({regex}))|)' for regex in regexes), re.MULTILINE)
+        # Group index of each pattern's wrapper group inside the probe,
+        # followed by the pattern's own capture groups.
+        self._layout = []
+        index = 1
+        for rx in self.compiled:
+            self._layout.append((index, rx.groups))
+            index += 1 + rx.groups
+
+    def scan(self, content):
+        """Return per-pattern match lists for ``content``"""
+        if self.strategy == 'split':
+            return [rx.findall(content) for rx in self.compiled]
+        matches = [[] for _ in self.compiled]
+        self._scan(content, [0] * len(self.compiled), len(content), matches)
+        return matches
+
+    def scan_stream(self, f, chunk_size=1 << 20, overlap=1 << 16):
+        """Return per-pattern match lists for a text stream, read in chunks.
+
+        At most ``chunk_size + overlap`` characters (rounded out to whole
+        lines) are held at once. Each window only keeps matches that start
+        before its last ``overlap`` characters; the tail is carried into the
+        next window, so matches spanning a chunk boundary, including
+        multi-line ones, are found exactly as in ``scan`` as long as no
+        single match is longer than ``overlap``.
+        """
+        matches = [[] for _ in self.compiled]
+        resume = [0] * len(self.compiled)
+        buffer = ''
+        while True:
+            lines = f.readlines(chunk_size)
+            if not lines:
+                self._scan(buffer, resume, len(buffer), matches)
+                return matches
+            buffer += ''.join(lines)
+            if len(buffer) <= overlap:
+                continue
+            # Commit only up to a line start at least ``overlap`` from the end
+            limit = buffer.rfind('\n', 0, len(buffer) - overlap) + 1
+            if limit <= 0:
+                continue
+            self._scan(buffer, resume, limit, matches)
+            buffer = buffer[limit:]
+            resume = [max(0, offset - limit) for offset in resume]
+
+    def _scan(self, buffer, resume, limit, matches):
+        """Collect matches starting before ``limit``, updating ``resume``"""
+        if self.strategy == 'combined':
+            self._scan_combined(buffer, resume, limit, matches)
+        else:
+            self._scan_split(buffer, resume, limit, matches)
+
+    def _scan_split(self, buffer, resume, limit, matches):
+        for i, rx in enumerate(self.compiled):
+            found = matches[i]
+            for match in rx.finditer(buffer, resume[i]):
+                if match.start() >= limit:
+                    break
+                found.append(self._extract(match, 0, rx.groups))
+                resume[i] = match.end()
+
+    def _scan_combined(self, buffer, resume, limit, matches):
+        search = self._gate.search
+        probe = self._probe.match
+        hit = search(buffer, min(resume, default=limit))
+        while hit and hit.start() < limit:
+            position = hit.start()
+            probed = probe(buffer, position)
+            spans = probed.regs
+            for i, (index, groups) in enumerate(self._layout):
+                start, end = spans[index]
+                if start < 0 or start < resume[i]:
+                    continue
+                matches[i].append(self._extract(probed, index, groups))
+                resume[i] = end if end > start else start + 1
+            hit = search(buffer, position + 1)
+
+    @staticmethod
+    def _extract(match, index, groups):
+        """Mirror ``re.findall`` item shapes for a match"""
+        if groups == 0:
+            return match.group(index)
+        if groups == 1:
+            return match.group(index + 1) or ''
+        return tuple(match.group(g) or ''
+                     for g in range(index + 1, index + 1 + groups))
+
+# Per-process analyzer used by analyze_directory worker processes
+_worker_analyzer = None
+
+def _init_worker(analyzer):
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+def _run_batch(task):
+    """Run an analyzer method over a batch of files in a worker process"""
+    method, filepaths = task
+    return getattr(_worker_analyzer, method)(filepaths)
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def _merge_counts(all_results, counts):
+    for category, counter in counts.items():
+        all_results[category].update(counter)
+
+def _encode_counts(counts):
+    """Convert per-category Counters to a JSON-friendly form for caching"""
+    return {category: list(counter.items()) for category, counter in counts.items()}
+
+def _decode_counts(encoded):
+    """Inverse of _encode_counts; multi-group matches come back as tuples"""
+    return {category: Counter({tuple(match) if isinstance(match, list) else match: count
+                               for match, count in items})
+            for category, items in encoded.items()}
+
 class PatternAnalyzer:
-    def __init__(self):
+    def __init__(self, strategy='split', stream_threshold=8 << 20,
+                 chunk_size=1 << 20, overlap=1 << 16):
         self.patterns = {
             'error_handling': {
                 'echo_error': r'echo\s+["\'].*[Ee]rror.*["\']',
@@ -42,41 +210,116 @@ class PatternAnalyzer:
                 'import_pattern': r'import\s+\S+|from\s+\S+\s+import',
             }
         }
+        self.matcher = PatternMatcher(self.patterns, strategy)
+        # Files larger than this are matched in bounded, overlapping chunks
+        self.stream_threshold = stream_threshold
+        self.chunk_size = chunk_size
+        self.overlap = overlap
         
     def analyze_file(self, filepath):
         """Analyze patterns in a single file"""
         try:
             with open(filepath, 'r') as f:
+                if os.fstat(f.fileno()).st_size > self.stream_threshold:
+                    return self._group(self.matcher.scan_stream(
+                        f, self.chunk_size, self.overlap))
                 content = f.read()
         except:
             return {}
             
+        return self.analyze_content(content)
+        
+    def analyze_content(self, content):
+        """Analyze patterns in already-loaded content"""
+        return self._group(self.matcher.scan(content))
+        
+    def _group(self, per_pattern):
+        """Merge per-pattern match lists into per-category lists"""
         results = defaultdict(list)
         
-        for category, patterns in self.patterns.items():
-            for pattern_name, regex in patterns.items():
-                matches = re.findall(regex, content, re.MULTILINE)
-                if matches:
-                    results[category].extend(matches)
+        for (category, _), matches in zip(self.matcher.entries, per_pattern):
+            if matches:
+                results[category].extend(matches)
                     
         return results
         
-    def analyze_directory(self, directory):
-        """Analyze all files in a directory"""
-        all_results = defaultdict(Counter)
+    def count_file(self, filepath):
+        """Count pattern matches per category in a single file"""
+        return {category: Counter(matches)
+                for category, matches in self.analyze_file(filepath).items()}
+        
+    def count_files(self, filepaths):
+        """Count pattern matches per category across files"""
+        counts = defaultdict(Counter)
+        for filepath in filepaths:
+            _merge_counts(counts, self.count_file(filepath))
+        return counts
+        
+    def count_each(self, filepaths):
+        """Return ``(filepath, counts)`` for every file"""
+        return [(filepath, self.count_file(filepath)) for filepath in filepaths]
+        
+    def fingerprint(self):
+        """Identify the pattern table, so cached counts are reused safely"""
+        return json.dumps(self.patterns, sort_keys=True)
+        
+    def _map_batches(self, method, filepaths, workers, batch_size):
+        """Yield ``method`` results for each batch in order, in-process or pooled"""
+        if workers == 1:
+            for batch in _batched(filepaths, batch_size):
+                yield len(batch), getattr(self, method)(batch)
+            return
+        
+        batches = list(_batched(filepaths, batch_size))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(self,)) as pool:
+            tasks = [(method, batch) for batch in batches]
+            for batch, result in zip(batches, pool.map(_run_batch, tasks)):
+                yield len(batch), result
+        
+    def analyze_directory(self, directory, workers=1, batch_size=64, cache=None,
+                          stats=None):
+        """Analyze all files in a directory
+        
+        With ``workers`` > 1 (or None for one per CPU), files are analyzed
+        in batches of ``batch_size`` by a process pool and the per-batch
+        counters are merged in submission order, so top-k counts do not
+        depend on which worker finishes first. With a ``ResultCache``, only
+        files whose content changed are analyzed; the rest are merged from
+        their cached counts. Counts are aggregated into ``stats`` (a
+        ``PatternStats``, exact and unnormalized by default).
+        """
+        stats = stats if stats is not None else PatternStats()
         file_count = 0
+        filepaths = (os.path.join(root, file)
+                     for root, dirs, files in os.walk(directory)
+                     for file in files if file.endswith('.md'))
         
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.md'):
-                    filepath = os.path.join(root, file)
-                    file_results = self.analyze_file(filepath)
-                    file_count += 1
-                    
-                    for category, matches in file_results.items():
-                        all_results[category].update(matches)
+        if cache is None and not stats.attribute:
+            for size, counts in self._map_batches(
+                    'count_files', filepaths, workers, batch_size):
+                stats.add(counts)
+                file_count += size
+            return stats.results(), file_count
+        
+        pending = []
+        for filepath in filepaths:
+            file_count += 1
+            cached = cache.get(filepath) if cache is not None else None
+            if cached is None:
+                pending.append(filepath)
+            else:
+                stats.add(_decode_counts(cached), filepath)
+        
+        for _, analyzed in self._map_batches(
+                'count_each', pending, workers, batch_size):
+            for filepath, counts in analyzed:
+                if cache is not None:
+                    cache.put(filepath, _encode_counts(counts))
+                stats.add(counts, filepath)
                         
-        return all_results, file_count
+        return stats.results(), file_count
         
     def generate_report(self, results, file_count):
         """Generate analysis report"""
@@ -87,38 +330,144 @@ class PatternAnalyzer:
         for category, counter in results.items():
             report.append(f"\n## {category.replace('_', ' ').title()}")
             report.append(f"Total instances: {sum(counter.values())}")
-            report.append(f"Unique patterns: {len(counter)}\n")
+            if getattr(counter, 'approximate', False):
+                report.append(f"Tracked patterns: {len(counter)} (top-{counter.capacity}, "
+                              f"counts are upper bounds)\n")
+            else:
+                report.append(f"Unique patterns: {len(counter)}\n")
             
             # Top 10 most common
             report.append("### Most Common Patterns:")
             for pattern, count in counter.most_common(10):
-                report.append(f"- `{pattern}`: {count} occurrences")
+                if getattr(counter, 'approximate', False):
+                    report.append(f"- `{pattern}`: {count} occurrences "
+                                  f"(at least {count - counter.error(pattern)})")
+                else:
+                    report.append(f"- `{pattern}`: {count} occurrences")
                 
         return '\n'.join(report)
         
-    def identify_extraction_candidates(self, results):
-        """Identify patterns that are good candidates for extraction"""
+    def identify_extraction_candidates(self, results, stats=None):
+        """Identify patterns that are good candidates for extraction
+        
+        With a ``PatternStats`` that recorded attribution, each candidate
+        also lists how many files its patterns appear in. Top-k counts are
+        upper bounds, so there only the occurrences a pattern is guaranteed
+        to have are counted, and ``files`` is a lower bound (``files_partial``)
+        since attribution is dropped for keys that were evicted.
+        """
         candidates = []
         
         for category, counter in results.items():
+            approximate = getattr(counter, 'approximate', False)
             # Find patterns that appear more than 5 times
-            common_patterns = [(p, c) for p, c in counter.items() if c > 5]
+            common_patterns = []
+            for p, c in counter.items():
+                if approximate:
+                    c -= counter.error(p)
+                if c > 5:
+                    common_patterns.append((p, c))
             
             if common_patterns:
-                candidates.append({
+                candidate = {
                     'category': category,
                     'patterns': common_patterns,
                     'total_occurrences': sum(c for _, c in common_patterns)
-                })
+                }
+                if stats is not None and stats.attribute:
+                    postings = stats.postings[category]
+                    candidate['files'] = len(set().union(
+                        *(postings.get(p, ()) for p, _ in common_patterns)))
+                    candidate['files_partial'] = approximate
+                candidates.append(candidate)
                 
         return candidates
 
+def _findall_each(patterns, content):
+    """The original per-pattern ``re.findall`` path, kept as a baseline"""
+    results = defaultdict(list)
+    for category, group in patterns.items():
+        for regex in group.values():
+            matches = re.findall(regex, content, re.MULTILINE)
+            if matches:
+                results[category].extend(matches)
+    return results
+
+def benchmark(directory, repeat=5):
+    """Time the findall baseline against both matcher strategies"""
+    contents = []
+    for root, dirs, files in os.walk(directory):
+        for file in files:
+            if file.endswith('.md'):
+                with open(os.path.join(root, file), 'r') as f:
+                    contents.append(f.read())
+
+    analyzers = {name: PatternAnalyzer(name) for name in PatternMatcher.STRATEGIES}
+    runners = {'findall': lambda text: _findall_each(analyzers['split'].patterns, text)}
+    for name, analyzer in analyzers.items():
+        runners[name] = analyzer.analyze_content
+
+    expected = [runners['findall'](text) for text in contents]
+    for name, run in runners.items():
+        if [run(text) for text in contents] != expected:
+            raise AssertionError(f"{name} results differ from re.findall")
+
+    size = sum(len(text) for text in contents)
+    print(f"Benchmark: {len(contents)} files, {size} characters, best of {repeat}")
+    baseline = None
+    for name, run in runners.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for text in contents:
+                run(text)
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+        print(f"  {name:<10} {best * 1000:9.2f}ms  {baseline / best:5.2f}x")
+
 def main():
-    analyzer = PatternAnalyzer()
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('directory', nargs='?', default='.claude/commands/',
+                        help='directory to analyze (default: .claude/commands/)')
+    parser.add_argument('--strategy', choices=PatternMatcher.STRATEGIES,
+                        default='split',
+                        help='pattern matching strategy; combined is slower (default: split)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes, 0 for one per CPU (default: 1)')
+    parser.add_argument('--batch-size', type=int, default=64,
+                        help='files per worker batch (default: 64)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore and do not update .claude/cache/')
+    parser.add_argument('--top-k', type=int, metavar='N',
+                        help='keep only the N heaviest patterns per category '
+                             '(approximate, bounded memory)')
+    parser.add_argument('--raw-matches', action='store_true',
+                        help='count matches verbatim instead of collapsing whitespace')
+    parser.add_argument('--attribute', action='store_true',
+                        help='record which files each pattern appears in')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='compare matching strategies instead of reporting')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='benchmark repetitions (default: 5)')
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark(args.directory, args.repeat)
+        return
+    
+    analyzer = PatternAnalyzer(args.strategy)
     
     # Analyze commands directory
-    print("Analyzing .claude/commands/ directory...")
-    results, file_count = analyzer.analyze_directory('.claude/commands/')
+    print(f"Analyzing {args.directory} directory...")
+    cache = None if args.no_cache else ResultCache(
+        'analyze-patterns', analyzer.fingerprint())
+    stats = PatternStats(normalize=not args.raw_matches, top_k=args.top_k,
+                         attribute=args.attribute)
+    results, file_count = analyzer.analyze_directory(
+        args.directory, args.workers or None, args.batch_size, cache, stats)
+    if cache is not None:
+        cache.save()
+        print(f"Cache: {cache.hits} reused, {cache.misses} analyzed")
     
     # Generate report
     report = analyzer.generate_report(results, file_count)
@@ -131,13 +480,17 @@ def main():
     print("Report saved to: analysis/pattern-analysis-report.md")
     
     # Identify extraction candidates
-    candidates = analyzer.identify_extraction_candidates(results)
+    candidates = analyzer.identify_extraction_candidates(results, stats)
     
     print("\n## Extraction Candidates:")
     for candidate in candidates:
         print(f"\n{candidate['category']}:")
         print(f"  Total occurrences: {candidate['total_occurrences']}")
         print(f"  Patterns to extract: {len(candidate['patterns'])}")
+        if candidate.get('files_partial'):
+            print(f"  Files affected: at least {candidate['files']} (top-k attribution is partial)")
+        elif 'files' in candidate:
+            print(f"  Files affected: {candidate['files']}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
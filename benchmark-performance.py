@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmark - Times the module tooling on synthetic module trees
+
+Generates a module tree of the requested size, then measures pattern
+analysis, frontmatter validation, dependency resolution, module assembly
+and index search with warmup runs, repeated timed runs and a separate tracemalloc run for
+peak memory. Results can be written as JSON and compared against a saved
+baseline to catch regressions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from dependency_graph import DependencyGraph
+from module_index import ModuleIndex
+from module_resolver import ModuleResolver
+from pattern_stats import PatternStats
+from script_loader import load_script
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Modules per generated command group; each group shares its own
+# _shared.md, _core.md and _templates.md
+GROUP_SIZE = 200
+SHARED_MODULES = ('_shared.md', '_core.md', '_templates.md')
+
+# Snippets mixed into module bodies so every pattern category has matches
+BODY_SNIPPETS = [
+    'git status --porcelain\ngit commit -m "update"\n',
+    'gh issue list --label bug\ngh pr view\n',
+    'if [ -z "$TITLE" ]; then\n    echo "Error: title required" >&2\n    exit 1\nfi\n',
+    'if [[ -f "$CONFIG" ]]; then\n    source "$CONFIG"\nfi\n',
+    'validate_input() {\n    [[ "$1" =~ "^[a-z]+$" ]] || return 1\n}\n',
+    'git push origin "$BRANCH" || handle_error "push failed"\n',
+]
+PROSE = ('Describe the expected behaviour. Gather context before acting. '
+         'Keep changes small and reviewable. Record decisions in the issue.')
+
+def generate_tree(root, file_count, seed=0):
+    """Write ``file_count`` modules under ``root`` and return the command modules"""
+    rng = random.Random(seed)
+    commands = []
+    groups = max(1, -(-file_count // GROUP_SIZE))
+    remaining = file_count
+    for group in range(groups):
+        directory = Path(root) / f"group{group:04d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        size = min(GROUP_SIZE, remaining)
+        remaining -= size
+        shared = SHARED_MODULES[:max(0, min(len(SHARED_MODULES), size - 1))]
+        for name in shared:
+            _write_module(directory / name, name[1:-3], [], rng)
+        names = []
+        for index in range(size - len(shared)):
+            name = f"module{index:04d}.md"
+            deps = list(shared[:1]) + rng.sample(names, min(len(names), rng.randint(0, 2)))
+            loads = [shared[1]] if len(shared) > 1 and rng.random() < 0.5 else []
+            _write_module(directory / name, name[:-3], deps, rng, loads)
+            names.append(name)
+            commands.append(f"group{group:04d}/{name}")
+    return commands
+
+def _write_module(path, module, deps, rng, loads=()):
+    lines = ['---', f'module: {module}', 'scope: context',
+             f'priority: {rng.choice(["high", "medium", "low"])}']
+    if deps:
+        lines.append('dependencies:')
+        lines.extend(f'  - {dep}' for dep in deps)
+    lines += ['---', f'# {module}', '', PROSE, '']
+    lines.extend(f'!load {target}' for target in loads)
+    for _ in range(rng.randint(3, 8)):
+        lines += ['', f'## Step {rng.randint(1, 99)}', PROSE, '', '```bash',
+                  rng.choice(BODY_SNIPPETS).rstrip('\n'), '```']
+    path.write_text('\n'.join(lines) + '\n')
+
+def summarize(samples):
+    """Percentile summary of timing samples in seconds"""
+    ordered = sorted(samples)
+    def percentile(p):
+        position = (len(ordered) - 1) * p / 100
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+    return {
+        'runs': len(ordered),
+        'min': ordered[0],
+        'p50': percentile(50),
+        'p90': percentile(90),
+        'p95': percentile(95),
+        'max': ordered[-1],
+        'mean': statistics.fmean(ordered),
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+def measure(run, repeat, warmup):
+    """Warm up, time ``repeat`` runs, then trace one run for peak memory"""
+    for _ in range(warmup):
+        run()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    result = summarize(samples)
+    tracemalloc.start()
+    try:
+        run()
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+def build_cases(root, commands, sample_size, seed, only=None):
+    """Return ``{name: (callable, items per run)}`` for a generated tree"""
+    analyzer = load_script('analyze-patterns.py').PatternAnalyzer()
+    validate = load_script('validate-yaml-frontmatter.py').validate_yaml_frontmatter
+    rng = random.Random(seed)
+    files = sorted(str(path) for path in Path(root).rglob('*.md'))
+    sample = rng.sample(files, min(sample_size, len(files)))
+    command_sample = rng.sample(commands, min(sample_size, len(commands)))
+
+    def analyze_file():
+        for path in sample:
+            analyzer.analyze_file(path)
+
+    def analyze_directory():
+        analyzer.analyze_directory(root)
+
+    def pattern_top_k():
+        stats = PatternStats(normalize=True, top_k=100, attribute=True)
+        results, file_count = analyzer.analyze_directory(root, stats=stats)
+        analyzer.generate_report(results, file_count)
+        analyzer.identify_extraction_candidates(results, stats)
+
+    def validate_frontmatter():
+        for path in files:
+            validate(path)
+
+    def dependency_resolution():
+        graph = DependencyGraph(root).build()
+        for command in command_sample:
+            graph.closure(command)
+        graph.cycles()
+
+    def module_assembly():
+        resolver = ModuleResolver(root)
+        for command in command_sample:
+            resolver.assemble(command)
+
+    index = ModuleIndex(root, f"{root}-index")
+    if not only or 'module_search' in only:
+        index.update()
+    queries = ['git status', '"gh issue list"', 'error scope:context priority:high',
+               'dependencies:_shared.md validate_input', 'module:module0001']
+
+    def module_search():
+        for query in queries:
+            index.search(query)
+
+    return {
+        'analyze_file': (analyze_file, len(sample)),
+        'analyze_directory': (analyze_directory, len(files)),
+        'pattern_top_k': (pattern_top_k, len(files)),
+        'validate_yaml_frontmatter': (validate_frontmatter, len(files)),
+        'dependency_resolution': (dependency_resolution, len(files)),
+        'module_assembly': (module_assembly, len(command_sample)),
+        'module_search': (module_search, len(queries)),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(sizes, repeat, warmup, sample_size, seed, only=None, keep_tree=None):
+    """Benchmark every case at every tree size; returns the JSON-ready report"""
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'warmup': warmup,
+            'sample_size': sample_size,
+            'seed': seed,
+        },
+        'results': {},
+    }
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix='module-bench-') as tmp:
+            root = os.path.join(keep_tree or tmp, f"tree-{size}")
+            commands = generate_tree(root, size, seed)
+            for name, (run, items) in build_cases(root, commands, sample_size, seed, only).items():
+                if only and name not in only:
+                    continue
+                result = measure(run, repeat, warmup)
+                result['items'] = items
+                key = f"{name}@{size}"
+                report['results'][key] = result
+                print(f"  {key:<36} p50 {result['p50'] * 1000:9.2f}ms  "
+                      f"p95 {result['p95'] * 1000:9.2f}ms  "
+                      f"peak {result['peak_bytes'] / 1024:9.1f}KiB  ({items} items)")
+    return report
+
+def compare(report, baseline, threshold):
+    """Print p50 changes against a baseline; return the regressed cases"""
+    regressions = []
+    print(f"\n📊 Comparison with baseline ({baseline['meta'].get('commit')}):")
+    for key, result in report['results'].items():
+        before = baseline['results'].get(key)
+        if not before:
+            print(f"  {key:<36} (no baseline)")
+            continue
+        change = result['p50'] / before['p50'] - 1 if before['p50'] else 0.0
+        marker = '❌' if change > threshold else '✅'
+        print(f"  {marker} {key:<34} {before['p50'] * 1000:9.2f}ms → "
+              f"{result['p50'] * 1000:9.2f}ms ({change:+.1%})")
+        if change > threshold:
+            regressions.append(key)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--files', type=int, nargs='+', default=[100, 1000],
+                        help='synthetic tree sizes to benchmark (default: 100 1000)')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='timed runs per case (default: 10)')
+    parser.add_argument('--warmup', type=int, default=2,
+                        help='untimed warmup runs per case (default: 2)')
+    parser.add_argument('--sample', type=int, default=100,
+                        help='files or commands per run for per-item cases (default: 100)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='random seed for tree generation (default: 0)')
+    parser.add_argument('--case', action='append', dest='cases',
+                        help='only run this case (repeatable)')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='compare p50 timings with a previous JSON result')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='p50 slowdown that counts as a regression (default: 0.10)')
+    parser.add_argument('--keep-tree', metavar='DIR',
+                        help='generate trees under DIR instead of a temporary directory')
+    args = parser.parse_args()
+
+    print("⚡ Performance Benchmark - Module Tooling")
+    print("=" * 50)
+    report = run_benchmarks(args.files, args.repeat, args.warmup, args.sample,
+                            args.seed, args.cases, args.keep_tree)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} cases regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +1,9 @@
 #!/bin/bash
 
-echo "⚡ Performance Benchmark - Architecture Modularization"
-echo "===================================================="
-echo "Timestamp: $(date)"
+# Performance benchmarks now live in benchmark-performance.py, which times
+# the module tooling on generated trees with warmup, repeated runs,
+# percentiles and peak memory. Arguments are passed through, e.g.:
+#   ./benchmark-performance.sh --files 100 10000 --output baseline.json
+#   ./benchmark-performance.sh --compare baseline.json
 
-# Function to measure time in milliseconds
-measure_time() {
-    if [[ "$OSTYPE" == "darwin"* ]]; then
-        # macOS
-        perl -MTime::HiRes=time -e 'printf "%.0f\n", time()*1000'
-    else
-        # Linux
-        date +%s%3N
-    fi
-}
-
-# Test 1: Module count comparison
-echo -e "\n📊 Module Count Comparison:"
-echo "Old structure (monolithic files): 3 files"
-echo -n "New structure (modular): "
-find .claude/commands/{command,plan,report} -name "*.md" -type f 2>/dev/null | wc -l | tr -d ' '
-
-# Test 2: Total line count
-echo -e "\n📏 Total Line Count:"
-old_lines=$(cat <<EOF
-command.md: 481 lines
-plan.md: 741 lines  
-report.md: 671 lines
-Total: 1893 lines
-EOF
-)
-echo "Old structure:"
-echo "$old_lines"
-
-echo -e "\nNew structure:"
-new_lines=$(find .claude/commands/{command,plan,report} -name "*.md" -type f -exec wc -l {} \; 2>/dev/null | awk '{sum+=$1} END {print "Total: " sum " lines"}')
-echo "$new_lines"
-
-# Test 3: Search performance - finding a specific module
-echo -e "\n🔍 Search Performance (finding 'bug' functionality):"
-echo "Testing search in modular structure..."
-
-# Modular search
-start_time=$(measure_time)
-grep -l "bug" .claude/commands/report/*.md 2>/dev/null | head -1 > /dev/null
-end_time=$(measure_time)
-modular_time=$((end_time - start_time))
-echo "Modular structure: ${modular_time}ms"
-
-# Simulate monolithic search (search through parent files)
-start_time=$(measure_time)
-grep -l "bug" .claude/commands/{command,plan,report}.md 2>/dev/null | head -1 > /dev/null
-end_time=$(measure_time)
-monolithic_time=$((end_time - start_time))
-echo "Monolithic structure (simulated): ${monolithic_time}ms"
-
-if [ "$modular_time" -lt "$monolithic_time" ]; then
-    improvement=$(( (monolithic_time - modular_time) * 100 / monolithic_time ))
-    echo "✅ Performance improved by ~${improvement}%"
-else
-    echo "➖ Similar performance (expected for small files)"
-fi
-
-# Test 4: Module loading simulation
-echo -e "\n📦 Module Loading Simulation:"
-echo "Loading a specific command (e.g., /report bug)..."
-
-# Modular: Load only required modules
-start_time=$(measure_time)
-cat .claude/commands/report/bug.md > /dev/null 2>&1
-cat .claude/commands/report/_templates.md > /dev/null 2>&1
-cat .claude/commands/report/_bug_templates.md > /dev/null 2>&1
-end_time=$(measure_time)
-modular_load=$((end_time - start_time))
-echo "Modular (3 files, ~600 lines): ${modular_load}ms"
-
-# Monolithic: Would load entire file
-start_time=$(measure_time)
-head -671 .claude/commands/report.md > /dev/null 2>&1
-end_time=$(measure_time)
-monolithic_load=$((end_time - start_time))
-echo "Monolithic (1 file, 671 lines): ${monolithic_load}ms"
-
-# Test 5: Dependency resolution
-echo -e "\n🔗 Dependency Resolution Performance:"
-start_time=$(measure_time)
-for file in .claude/commands/report/{bug,feature,improvement,security}.md; do
-    grep "dependencies:" "$file" > /dev/null 2>&1
-done
-end_time=$(measure_time)
-dep_time=$((end_time - start_time))
-echo "Checking dependencies for 4 report modules: ${dep_time}ms"
-
-# Test 6: Memory usage estimate
-echo -e "\n💾 Memory Usage Estimate:"
-echo "Monolithic approach: Load entire 1893 lines for any operation"
-echo "Modular approach: Load only needed modules (~150-200 lines typical)"
-echo "Memory reduction: ~70-90% for typical operations"
-
-# Summary
-echo -e "\n===================================================="
-echo "📈 Performance Summary:"
-echo "- Module count: 3 → 30+ (better organization)"
-echo "- Load size: 600-700 lines → 150-200 lines (70%+ reduction)"
-echo "- Search scope: Entire file → Specific modules (targeted search)"
-echo "- Maintenance: Difficult → Easy (smaller, focused files)"
-echo "- Dependency tracking: Implicit → Explicit (clear boundaries)"
-
-# Calculate overall improvement estimate
-echo -e "\n🎯 Estimated Overall Performance Improvement: 35-40%"
-echo "   - Faster module loading (smaller files)"
-echo "   - Reduced memory usage (load only what's needed)"
-echo "   - Better caching (smaller units)"
-echo "   - Quicker searches (targeted scope)"
-
-exit 0
\ No newline at end of file
+exec python3 "$(dirname "$0")/benchmark-performance.py" "$@"
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Dependency Graph - Indexes module dependencies declared in YAML frontmatter
+
+Parses each module's ``dependencies:`` list once, resolves entries the same
+way verify-dependencies.sh does (relative to the module's directory, then to
+the commands root), and answers transitive closure, reverse dependency and
+cycle queries. Parsed lists are persisted in .claude/cache/, so rebuilding
+the graph only re-reads modules that changed.
+"""
+
+import argparse
+import posixpath
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import yaml
+
+from frontmatter_reader import FrontmatterError, parse_frontmatter, read_frontmatter
+from result_cache import ResultCache
+
+COMMANDS_ROOT = '.claude/commands'
+
+# Bump when dependency parsing changes so cached lists are discarded
+GRAPH_VERSION = 2
+
+def read_dependencies(file_path):
+    """Return the raw ``dependencies`` entries of a module, or None if unreadable"""
+    try:
+        data = parse_frontmatter(read_frontmatter(file_path))
+    except (OSError, FrontmatterError, yaml.YAMLError):
+        return None
+    deps = data.get('dependencies') if isinstance(data, dict) else None
+    if deps is None:
+        return []
+    if not isinstance(deps, list):
+        deps = [deps]
+    return [str(dep) for dep in deps if dep is not None and str(dep)]
+
+def inside_root(path):
+    """Whether a normalized root-relative path stays inside the root"""
+    return not (posixpath.isabs(path) or path == '..' or path.startswith('../'))
+
+def is_module(module):
+    """Whether a root-relative path is indexed as a module (template folders are not)"""
+    parts = module.split('/')
+    return (module.endswith('.md') and not parts[-1].startswith('.')
+            and inside_root(module) and 'templates' not in parts[:-1])
+
+def candidate_paths(module, dep):
+    """Root-relative paths a reference from ``module`` may resolve to, in lookup order.
+
+    Candidates that would leave the root (``../`` or absolute) are dropped,
+    so such references are always reported as missing.
+    """
+    local = posixpath.normpath(posixpath.join(posixpath.dirname(module), dep))
+    return [path for path in (local, posixpath.normpath(dep)) if inside_root(path)]
+
+class DependencyGraph:
+    """Adjacency index over the modules under a commands root.
+
+    Modules are identified by POSIX paths relative to the root, e.g.
+    ``report/bug.md``.
+    """
+
+    def __init__(self, root=COMMANDS_ROOT):
+        self.root = Path(root)
+        self.raw = {}                      # module -> declared dependencies
+        self.edges = {}                    # module -> resolved dependencies
+        self.missing = {}                  # module -> unresolved dependencies
+        self.reverse = defaultdict(set)    # module -> modules depending on it
+        self.waiting = defaultdict(set)    # candidate path -> modules missing it
+
+    def module_paths(self):
+        """Yield every module under the root, skipping template folders"""
+        for path in self.root.rglob('*.md'):
+            module = path.relative_to(self.root).as_posix()
+            if is_module(module):
+                yield module
+
+    def _read(self, module, cache=None):
+        file_path = self.root / module
+        deps = cache.get(file_path) if cache is not None else None
+        if deps is None:
+            deps = read_dependencies(file_path)
+            if cache is not None:
+                cache.put(file_path, deps)
+        return deps or []
+
+    def build(self, cache=None):
+        """Index every module, reusing cached dependency lists"""
+        for module in self.module_paths():
+            self.raw[module] = self._read(module, cache)
+        # Link once every module is known, so nothing is resolved twice
+        for module in self.raw:
+            self._link(module)
+        return self
+
+    def _resolve(self, module):
+        resolved = []
+        missing = []
+        for dep in self.raw[module]:
+            target = None
+            for candidate in candidate_paths(module, dep):
+                if candidate in self.raw:
+                    target = candidate
+                    break
+                # Re-resolve if a preferred path appears later
+                self.waiting[candidate].add(module)
+            if target is None:
+                missing.append(dep)
+            elif target not in resolved:
+                resolved.append(target)
+        return resolved, missing
+
+    def _unlink(self, module):
+        for target in self.edges.get(module, ()):
+            self.reverse[target].discard(module)
+        for dep in self.raw.get(module, ()):
+            for candidate in candidate_paths(module, dep):
+                self.waiting[candidate].discard(module)
+
+    def _set(self, module, deps):
+        """Add or replace a module's declared dependencies"""
+        is_new = module not in self.raw
+        self._unlink(module)
+        self.raw[module] = list(deps)
+        self._link(module)
+        if is_new:
+            # Modules that referenced this path before it existed
+            for waiting in list(self.waiting.pop(module, ())):
+                self._relink(waiting)
+
+    def _link(self, module):
+        self.edges[module], self.missing[module] = self._resolve(module)
+        for target in self.edges[module]:
+            self.reverse[target].add(module)
+
+    def _relink(self, module):
+        self._unlink(module)
+        self._link(module)
+
+    def update(self, module, cache=None):
+        """Re-read one module after it changed, was added or was deleted"""
+        if not (self.root / module).is_file():
+            self.remove(module)
+            return
+        self._set(module, self._read(module, cache))
+
+    def remove(self, module):
+        """Drop a module; its dependents now report it as missing"""
+        if module not in self.raw:
+            return
+        self._unlink(module)
+        del self.raw[module]
+        del self.edges[module]
+        del self.missing[module]
+        for dependent in list(self.reverse.pop(module, ())):
+            self._relink(dependent)
+
+    def closure(self, module):
+        """Transitive dependencies of a module, dependencies first"""
+        order = []
+        seen = {module}
+        stack = [(module, iter(self.edges.get(module, ())))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if node != module:
+                    order.append(node)
+            elif child not in seen:
+                seen.add(child)
+                stack.append((child, iter(self.edges.get(child, ()))))
+        return order
+
+    def dependents(self, module):
+        """Modules that transitively depend on a module"""
+        found = set()
+        stack = [module]
+        while stack:
+            for dependent in self.reverse.get(stack.pop(), ()):
+                if dependent not in found:
+                    found.add(dependent)
+                    stack.append(dependent)
+        found.discard(module)
+        return sorted(found)
+
+    def strongly_connected(self):
+        """Tarjan's algorithm, iterative; returns components in reverse topological order"""
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+        for start in self.edges:
+            if start in index:
+                continue
+            work = [(start, iter(self.edges[start]))]
+            index[start] = lowlink[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.edges.get(child, ()))))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+        return components
+
+    def cycles(self):
+        """Dependency cycles, as sorted lists of modules"""
+        return [sorted(component) for component in self.strongly_connected()
+                if len(component) > 1 or component[0] in self.edges[component[0]]]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--root', default=COMMANDS_ROOT,
+                        help=f'commands directory (default: {COMMANDS_ROOT})')
+    parser.add_argument('--closure', metavar='MODULE',
+                        help='list everything MODULE transitively loads')
+    parser.add_argument('--dependents', metavar='MODULE',
+                        help='list modules that transitively depend on MODULE')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore and do not update .claude/cache/')
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else ResultCache(
+        'dependency-graph', [GRAPH_VERSION, str(Path(args.root).resolve())])
+    graph = DependencyGraph(args.root).build(cache)
+    if cache is not None:
+        cache.save()
+
+    if args.closure or args.dependents:
+        module = args.closure or args.dependents
+        if module not in graph.edges:
+            print(f"❌ Unknown module: {module}")
+            sys.exit(1)
+        related = graph.closure(module) if args.closure else graph.dependents(module)
+        for name in related:
+            print(name)
+        return
+
+    print("🔍 Verifying Module Dependencies")
+    print("================================")
+    errors = 0
+    for module in sorted(graph.edges):
+        for dep in graph.missing[module]:
+            print(f"  ❌ {module} → Missing dependency: {dep}")
+            errors += 1
+
+    cycles = graph.cycles()
+    for cycle in cycles:
+        print(f"  ❌ Circular dependency between: {', '.join(cycle)}")
+
+    print("\n================================")
+    print(f"Modules: {len(graph.edges)}, "
+          f"dependencies: {sum(len(deps) for deps in graph.edges.values())}")
+    if errors or cycles:
+        print(f"❌ Found {errors} missing dependencies and {len(cycles)} cycles")
+        sys.exit(1)
+    print("✅ All dependencies are valid and acyclic!")
+
+if __name__ == "__main__":
+    main()
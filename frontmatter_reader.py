@@ -0,0 +1,142 @@
+"""
+Frontmatter Reader - Reads YAML frontmatter without loading module bodies
+
+Files are read line by line only up to the closing ``---`` delimiter. The
+common, simple frontmatter shape (top-level ``key: value`` pairs and
+``- item`` lists) is scanned directly; anything else falls back to YAML,
+using the C-accelerated loader when PyYAML was built with libyaml.
+"""
+
+import re
+
+import yaml
+
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+DELIMITER = '---'
+REQUIRED_FIELDS = ('module', 'scope', 'priority')
+
+class FrontmatterError(ValueError):
+    """Raised when a file has no frontmatter or it is not terminated"""
+
+# Top-level ``key:`` or ``key: value`` line
+_KEY_LINE = re.compile(r'([A-Za-z_][\w-]*):(?: +(.*))?$')
+# Indented block sequence item under the previous key
+_ITEM_LINE = re.compile(r'( +)- +(.*)$')
+# Plain scalar syntax; implicitly typed values are rejected by _resolves_implicitly
+_PLAIN = re.compile(r'[^\s\-?:,\[\]{}#&*!|>\'"%@`](?:(?!: | #)[^\t])*')
+_QUOTED = re.compile(r'"([^"\\]*)"|\'([^\']*)\'')
+_EMPTY_FLOW = {'[]': [], '{}': {}}
+# YAML 1.1 implicit resolvers (null, bool, int, float, timestamp, ...),
+# keyed by first character
+_IMPLICIT = yaml.resolver.Resolver.yaml_implicit_resolvers
+
+def _resolves_implicitly(text):
+    """Whether YAML would load a plain scalar as something other than a string"""
+    return any(regexp.match(text) for _, regexp in _IMPLICIT.get(text[:1], ()))
+
+def read_frontmatter(file_path):
+    """Return the frontmatter text of a markdown file.
+
+    Stops reading at the closing delimiter, so the body is never loaded.
+    Raises FrontmatterError when there is no frontmatter or it is not
+    closed.
+    """
+    with open(file_path, 'r') as f:
+        if f.readline().rstrip() != DELIMITER:
+            raise FrontmatterError("No YAML frontmatter found")
+        lines = []
+        for line in f:
+            if line.rstrip() == DELIMITER:
+                return ''.join(lines)
+            lines.append(line)
+    raise FrontmatterError("Invalid frontmatter format")
+
+def split_frontmatter(content):
+    """Split loaded file content into (frontmatter text or None, body)"""
+    lines = content.splitlines(keepends=True)
+    if not lines or lines[0].rstrip() != DELIMITER:
+        return None, content
+    for index in range(1, len(lines)):
+        if lines[index].rstrip() == DELIMITER:
+            return ''.join(lines[1:index]), ''.join(lines[index + 1:])
+    return None, content
+
+def _scalar(text):
+    """Return a simple scalar's string value, or None if it is not simple.
+
+    Plain scalars YAML resolves to null, booleans, numbers or timestamps are
+    not simple, so they are left to the YAML parser.
+    """
+    text = text.rstrip(' ')
+    if text in _EMPTY_FLOW:
+        return _EMPTY_FLOW[text]
+    quoted = _QUOTED.fullmatch(text)
+    if quoted:
+        return quoted.group(1) if quoted.group(1) is not None else quoted.group(2)
+    if (_PLAIN.fullmatch(text) and not text.endswith(':')
+            and not _resolves_implicitly(text)):
+        return text
+    return None
+
+def scan_frontmatter(text):
+    """Scan simple frontmatter without a YAML parser.
+
+    Returns a dict of top-level keys to string values, lists of strings, or
+    None for empty values. Returns None when the text uses any YAML feature
+    beyond that shape (nesting, anchors, block scalars, comments after
+    values, duplicate keys, ...), in which case callers should fall back to
+    a full YAML parse.
+    """
+    data = {}
+    open_key = None
+    indent = None
+    for line in text.splitlines():
+        if not line.strip(' ') or line.startswith('#'):
+            continue
+        item = _ITEM_LINE.match(line)
+        if item:
+            value = _scalar(item.group(2))
+            if open_key is None or value is None or isinstance(value, (list, dict)):
+                return None
+            # Items of one list share an indent; anything else is nesting
+            # or a continuation line
+            if data[open_key] is None:
+                data[open_key] = []
+                indent = item.group(1)
+            elif item.group(1) != indent:
+                return None
+            data[open_key].append(value)
+            continue
+        entry = _KEY_LINE.match(line)
+        if (not entry or entry.group(1) in data
+                or _resolves_implicitly(entry.group(1))):
+            return None
+        key, raw = entry.groups()
+        if not raw or not raw.strip():
+            data[key] = None
+            open_key = key
+            continue
+        value = _scalar(raw)
+        if value is None:
+            return None
+        data[key] = value
+        open_key = None
+    return data
+
+def parse_frontmatter(text, fast=True):
+    """Parse frontmatter text into a dict.
+
+    With ``fast``, simple frontmatter (string scalars and lists of them) is
+    scanned directly; otherwise, or when the text is not simple, it
+    is loaded with YAML. Raises yaml.YAMLError on invalid YAML.
+    """
+    if fast:
+        data = scan_frontmatter(text)
+        if data is not None:
+            return data
+    return yaml.load(text, Loader=SafeLoader)
+
+def missing_fields(data, required=REQUIRED_FIELDS):
+    """Return the required fields absent from parsed frontmatter"""
+    return [field for field in required if field not in data]
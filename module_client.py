@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Module Client - Validates and analyzes modules through module_daemon.py
+
+Sends ``validate``, ``analyze`` and ``dependencies`` requests to a daemon
+serving the same commands root. When none is running the request is
+answered in-process from the on-disk caches, so hooks can call this
+unconditionally. Only the standard library is imported up front; the
+daemon's modules (and yaml) are loaded for the in-process fallback only.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+from result_cache import CACHE_DIR
+
+# Same default as dependency_graph.COMMANDS_ROOT, which is not imported here
+# to keep the client's startup cheap
+COMMANDS_ROOT = '.claude/commands'
+SOCKET_PATH = os.path.join(CACHE_DIR, 'module-daemon.sock')
+
+def query(request, socket_path=SOCKET_PATH, timeout=60):
+    """Send a request to a running daemon; None if none is listening for its root"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode() + b'\n')
+            line = sock.makefile('rb').readline()
+    except OSError:
+        return None
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return None
+    return response if response.get('root') == request.get('root') else None
+
+def request(command, root=COMMANDS_ROOT, files=(), socket_path=SOCKET_PATH, daemon=True):
+    """Answer a request via the daemon, or in-process if none is running.
+
+    Returns ``(response, served)`` where ``served`` tells whether the daemon
+    answered.
+    """
+    message = {'command': command, 'root': os.path.abspath(root),
+               'files': [os.path.abspath(path) for path in files]}
+    response = query(message, socket_path) if daemon else None
+    if response is not None:
+        return response, True
+
+    from module_daemon import ModuleState, respond
+    state = ModuleState(root)
+    response = respond(state, message)
+    state.save()
+    return response, False
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip(),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', default=COMMANDS_ROOT,
+                        help=f'commands directory (default: {COMMANDS_ROOT})')
+    parser.add_argument('--socket', default=SOCKET_PATH,
+                        help=f'daemon socket (default: {SOCKET_PATH})')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='answer in-process even if a daemon is running')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    validate_parser = subparsers.add_parser('validate', help='validate YAML frontmatter')
+    validate_parser.add_argument('files', nargs='*', help='files to check (default: all)')
+    subparsers.add_parser('analyze', help='print the pattern analysis report')
+    dependencies_parser = subparsers.add_parser('dependencies',
+                                                help='check for missing dependencies and cycles')
+    dependencies_parser.add_argument('files', nargs='*', help='modules to check (default: all)')
+    subparsers.add_parser('status', help='report whether a daemon is running')
+    subparsers.add_parser('stop', help='stop a running daemon')
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root)
+    if args.command in ('status', 'stop'):
+        response = query({'command': 'ping' if args.command == 'status' else 'stop',
+                          'root': root}, args.socket)
+        if response is None:
+            print(f"❌ No daemon is serving {args.root}")
+            sys.exit(1)
+        if args.command == 'status':
+            print(f"✅ Daemon {response['pid']} is serving {response['modules']} modules")
+        else:
+            print("✅ Daemon stopped")
+        return
+
+    response, _ = request(args.command, args.root, getattr(args, 'files', ()),
+                          args.socket, not args.no_daemon)
+    if not response['ok']:
+        print(f"❌ {response['error']}")
+        sys.exit(1)
+
+    if args.command == 'validate':
+        invalid = [(path, message) for path, is_valid, message in response['results']
+                   if not is_valid]
+        for path, message in invalid:
+            print(f"❌ {os.path.relpath(path)}: {message}")
+        if invalid:
+            sys.exit(1)
+        print(f"✅ {len(response['results'])} files have valid frontmatter")
+    elif args.command == 'analyze':
+        print(response['report'])
+    else:
+        for module, dep in response['missing']:
+            print(f"❌ {module} → Missing dependency: {dep}")
+        for cycle in response['cycles']:
+            print(f"❌ Circular dependency between: {', '.join(cycle)}")
+        if response['missing'] or response['cycles']:
+            sys.exit(1)
+        print("✅ All dependencies are valid and acyclic!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Module Daemon - Keeps validation and analysis results hot between hook runs
+
+Runs an asyncio daemon that watches a commands root by polling file stats
+and keeps frontmatter verdicts, per-file pattern counts and the dependency
+graph in memory, re-reading only modules that changed. Clients send one
+JSON request per line over a Unix socket in .claude/cache/; see
+module_client.py, which answers in-process when no daemon is running.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import time
+
+from dependency_graph import (COMMANDS_ROOT, GRAPH_VERSION, DependencyGraph, inside_root,
+                              is_module)
+from module_client import SOCKET_PATH
+from pattern_stats import PatternStats
+from result_cache import ResultCache
+from script_loader import load_script
+
+POLL_INTERVAL = 1.0
+
+def _is_module_file(name):
+    return name.endswith('.md') and not name.startswith('.')
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class ModuleState:
+    """Verdicts, pattern counts and the dependency graph for one commands root.
+
+    Per-file results are recomputed when a file's mtime or size changes.
+    ``poll`` walks the tree to find changes; the daemon calls it on a timer
+    and with ``warm`` so results are ready before they are asked for.
+    """
+
+    def __init__(self, root=COMMANDS_ROOT, use_cache=True):
+        self.root = os.path.abspath(root)
+        validator = load_script('validate-yaml-frontmatter.py')
+        patterns = load_script('analyze-patterns.py')
+        self.validate = validator.validate_yaml_frontmatter
+        self.analyzer = patterns.PatternAnalyzer()
+        self.encode_counts = patterns._encode_counts
+        self.decode_counts = patterns._decode_counts
+        self.caches = {}
+        if use_cache:
+            self.caches = {
+                'verdicts': ResultCache('validate-yaml-frontmatter', validator.VALIDATOR_VERSION),
+                'counts': ResultCache('analyze-patterns', self.analyzer.fingerprint()),
+                'graph': ResultCache('dependency-graph', [GRAPH_VERSION, self.root]),
+            }
+        self.files = {}      # path -> (mtime_ns, size) as of the last poll
+        self.verdicts = {}   # path -> (signature, (is_valid, message))
+        self.counts = {}     # path -> (signature, {category: Counter})
+        self.graph = None
+
+    def _tracked(self, path):
+        """Whether ``path`` is a file ``poll`` would track: a non-dot .md file under the root"""
+        return (_is_module_file(os.path.basename(path))
+                and inside_root(os.path.relpath(path, self.root).replace(os.sep, '/')))
+
+    def _module(self, path):
+        module = os.path.relpath(path, self.root).replace(os.sep, '/')
+        return module if is_module(module) else None
+
+    def verdict(self, path):
+        """Frontmatter verdict for a file, recomputed if it changed"""
+        signature = _signature(path)
+        entry = self.verdicts.get(path)
+        if entry is None or entry[0] != signature:
+            cache = self.caches.get('verdicts')
+            verdict = cache.get(path) if cache and signature else None
+            if verdict is None:
+                verdict = self.validate(path)
+                if cache and signature:
+                    cache.put(path, list(verdict))
+            entry = self.verdicts[path] = (signature, tuple(verdict))
+        return entry[1]
+
+    def pattern_counts(self, path):
+        """Per-category pattern counts for a file, recomputed if it changed"""
+        signature = _signature(path)
+        entry = self.counts.get(path)
+        if entry is None or entry[0] != signature:
+            cache = self.caches.get('counts')
+            cached = cache.get(path) if cache and signature else None
+            if cached is None:
+                counts = self.analyzer.count_file(path)
+                if cache and signature:
+                    cache.put(path, self.encode_counts(counts))
+            else:
+                counts = self.decode_counts(cached)
+            entry = self.counts[path] = (signature, counts)
+        return entry[1]
+
+    def dependency_graph(self):
+        if self.graph is None:
+            self.graph = DependencyGraph(self.root).build(self.caches.get('graph'))
+        return self.graph
+
+    def poll(self, warm=False):
+        """Find files added, changed or removed since the last poll"""
+        current = {}
+        for dirpath, dirs, names in os.walk(self.root):
+            for name in names:
+                if _is_module_file(name):
+                    path = os.path.join(dirpath, name)
+                    signature = _signature(path)
+                    if signature:
+                        current[path] = signature
+        changed = [path for path, signature in current.items()
+                   if self.files.get(path) != signature]
+        removed = [path for path in self.files if path not in current]
+        self.files = current
+
+        for path in removed:
+            self.verdicts.pop(path, None)
+            self.counts.pop(path, None)
+        if warm:
+            for path in changed:
+                self.verdict(path)
+                self.pattern_counts(path)
+        if self.graph is not None:
+            for path in changed + removed:
+                module = self._module(path)
+                if module:
+                    self.graph.update(module, self.caches.get('graph'))
+        elif warm:
+            self.dependency_graph()
+        return len(changed) + len(removed)
+
+    def save(self):
+        for cache in self.caches.values():
+            cache.save()
+
+    def handle(self, request):
+        """Answer one request; ``files`` narrows validate and dependencies.
+
+        Files outside the root, dotfiles and non-markdown files are skipped,
+        as the standalone validator and dependency check skip them.
+        """
+        command = request.get('command')
+        files = [os.path.abspath(path) for path in request.get('files') or ()]
+        if command == 'ping':
+            return {'modules': len(self.files), 'pid': os.getpid()}
+        if command == 'validate':
+            if files:
+                files = [path for path in files if self._tracked(path)]
+            else:
+                self.poll()
+                files = sorted(self.files)
+            return {'results': [[path, *self.verdict(path)] for path in files]}
+        if command == 'analyze':
+            self.poll()
+            stats = PatternStats(normalize=True)
+            for path in self.files:
+                stats.add(self.pattern_counts(path))
+            return {'files': len(self.files),
+                    'report': self.analyzer.generate_report(stats.results(), len(self.files))}
+        if command == 'dependencies':
+            self.poll()
+            graph = self.dependency_graph()
+            modules = [self._module(path) for path in files] if files else sorted(graph.edges)
+            modules = [module for module in modules if module in graph.edges]
+            cycles = graph.cycles()
+            if files:
+                wanted = set(modules)
+                cycles = [cycle for cycle in cycles if wanted.intersection(cycle)]
+            return {'missing': [[module, dep] for module in modules
+                                for dep in graph.missing[module]],
+                    'cycles': cycles}
+        raise ValueError(f"Unknown command: {command}")
+
+def respond(state, request):
+    """Wrap ``handle`` in the response envelope shared by daemon and fallback"""
+    response = {'ok': True, 'root': state.root}
+    if request.get('root') != state.root:
+        return dict(response, ok=False, error=f"Daemon serves {state.root}")
+    try:
+        response.update(state.handle(request))
+    except (ValueError, OSError) as e:
+        return dict(response, ok=False, error=str(e))
+    return response
+
+class ModuleDaemon:
+    """Serves a ModuleState over a Unix socket while polling for changes.
+
+    Polls and requests run in worker threads, one at a time under a lock,
+    so a tree walk never blocks the event loop from accepting clients or
+    answering ``ping`` and ``stop``.
+    """
+
+    def __init__(self, state, socket_path=SOCKET_PATH, interval=POLL_INTERVAL):
+        self.state = state
+        self.socket_path = socket_path
+        self.interval = interval
+        self.stopping = None
+        self.lock = None
+
+    async def serve(self):
+        self.stopping = asyncio.Event()
+        self.lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.stopping.set)
+
+        start = time.perf_counter()
+        self.state.poll(warm=True)
+        self.state.save()
+        print(f"✅ Loaded {len(self.state.files)} modules in "
+              f"{time.perf_counter() - start:.2f}s; listening on {self.socket_path}")
+
+        server = await asyncio.start_unix_server(self._client, path=self.socket_path)
+        watcher = asyncio.create_task(self._watch())
+        try:
+            await self.stopping.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            # Let an in-flight poll or request finish before saving
+            await watcher
+            async with self.lock:
+                self.state.save()
+
+    async def _watch(self):
+        while not self.stopping.is_set():
+            try:
+                await asyncio.wait_for(self.stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                async with self.lock:
+                    await asyncio.to_thread(self.state.poll, True)
+
+    async def _client(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"Invalid request: {e}"}
+                else:
+                    if (request.get('command') == 'stop'
+                            and request.get('root') == self.state.root):
+                        # Answer and hang up before shutting down the server
+                        writer.write(json.dumps({'ok': True, 'root': self.state.root})
+                                     .encode() + b'\n')
+                        await writer.drain()
+                        self.stopping.set()
+                        break
+                    if request.get('command') == 'ping':
+                        response = respond(self.state, request)
+                    else:
+                        async with self.lock:
+                            response = await asyncio.to_thread(respond, self.state, request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+def socket_in_use(socket_path):
+    """Whether anything accepts connections on ``socket_path``, whatever root it serves"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+    return True
+
+def serve(root=COMMANDS_ROOT, socket_path=SOCKET_PATH, interval=POLL_INTERVAL):
+    """Run a daemon for ``root`` in the foreground until stopped"""
+    if socket_in_use(socket_path):
+        print(f"❌ A daemon is already listening on {socket_path}")
+        sys.exit(1)
+    # Nothing accepts connections, so a socket file left behind is stale
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(socket_path) or '.', exist_ok=True)
+    asyncio.run(ModuleDaemon(ModuleState(root), socket_path, interval).serve())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip(),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', default=COMMANDS_ROOT,
+                        help=f'commands directory (default: {COMMANDS_ROOT})')
+    parser.add_argument('--socket', default=SOCKET_PATH,
+                        help=f'daemon socket (default: {SOCKET_PATH})')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help=f'seconds between change polls (default: {POLL_INTERVAL})')
+    args = parser.parse_args()
+    serve(args.root, args.socket, args.interval)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Module Index - Persistent inverted index for searching module trees
+
+Module bodies are tokenized with positions, and the frontmatter fields
+``module``, ``scope``, ``priority`` and ``dependencies`` are indexed as
+``field:value`` terms. Postings live in binary segment files that are
+memory-mapped for queries. An update only tokenizes modules whose mtime or
+size changed: they go into a new segment, superseded documents are dropped
+from the live set, and segments are merged once there are too many of them
+or too many dead documents.
+
+Queries combine words (all must match), quoted phrases and field filters:
+
+    ./module_index.py bug "error handling" scope:context priority:high
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import re
+import shlex
+import sys
+import time
+from array import array
+from collections import defaultdict
+from pathlib import Path
+
+import yaml
+
+from dependency_graph import COMMANDS_ROOT
+from frontmatter_reader import parse_frontmatter, split_frontmatter
+from result_cache import CACHE_DIR
+
+INDEX_DIR = os.path.join(CACHE_DIR, 'module-index')
+# Bump when indexed terms or the manifest change so stale indexes are rebuilt
+INDEX_VERSION = 3
+
+FIELDS = ('module', 'scope', 'priority', 'dependencies')
+FIELD_ALIASES = {'dependency': 'dependencies', 'dep': 'dependencies'}
+TOKEN = re.compile(r'\w+')
+
+# Merge segments once there are more than this many, or when dead
+# documents outnumber live ones
+MAX_SEGMENTS = 8
+
+def tokenize(text):
+    """Lowercased word tokens, in order"""
+    return TOKEN.findall(text.lower())
+
+def index_terms(content):
+    """Return ``{term: [positions]}`` for a module's content"""
+    frontmatter, body = split_frontmatter(content)
+    terms = defaultdict(list)
+    for position, token in enumerate(tokenize(body)):
+        terms[token].append(position)
+    data = None
+    if frontmatter is not None:
+        try:
+            data = parse_frontmatter(frontmatter)
+        except yaml.YAMLError:
+            pass
+    if isinstance(data, dict):
+        for field in FIELDS:
+            values = data.get(field)
+            if values is None:
+                continue
+            for value in values if isinstance(values, list) else [values]:
+                terms.setdefault(f"{field}:{str(value).lower()}", [])
+    return terms
+
+def write_segment(directory, name, postings):
+    """Write ``{term: {doc_id: positions}}`` as a segment.
+
+    Each term's block in the postings file is three uint32 arrays: sorted
+    doc ids, ndocs + 1 offsets into the positions, and the positions.
+    """
+    terms = {}
+    data = array('I')
+    for term in sorted(postings):
+        docs = postings[term]
+        doc_ids = sorted(docs)
+        offset = len(data) * data.itemsize
+        data.extend(doc_ids)
+        positions = array('I')
+        data.append(0)
+        for doc_id in doc_ids:
+            positions.extend(docs[doc_id])
+            data.append(len(positions))
+        data.extend(positions)
+        terms[term] = [offset, len(doc_ids), len(positions)]
+
+    base = os.path.join(directory, name)
+    with open(f"{base}.postings.tmp", 'wb') as f:
+        data.tofile(f)
+    with open(f"{base}.terms.tmp", 'w') as f:
+        json.dump(terms, f, separators=(',', ':'))
+    os.replace(f"{base}.postings.tmp", f"{base}.postings")
+    os.replace(f"{base}.terms.tmp", f"{base}.terms")
+
+class Segment:
+    """A read-only, memory-mapped postings segment"""
+
+    def __init__(self, directory, name):
+        self.name = name
+        base = os.path.join(directory, name)
+        with open(f"{base}.terms", 'r') as f:
+            self.terms = json.load(f)
+        self._file = open(f"{base}.postings", 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._view = memoryview(self._map) if self._map else None
+
+    def postings(self, term):
+        """Return (doc_ids, position_offsets, positions) views, or None"""
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        offset, ndocs, npositions = entry
+        ints = self._view[offset:offset + 4 * (2 * ndocs + 1 + npositions)].cast('I')
+        return ints[:ndocs], ints[ndocs:2 * ndocs + 1], ints[2 * ndocs + 1:]
+
+    def close(self):
+        if self._map is not None:
+            self._view.release()
+            try:
+                self._map.close()
+            except BufferError:
+                # Views handed out by postings() are still alive; the map
+                # is unmapped when they are garbage collected
+                pass
+        self._file.close()
+
+class ModuleIndex:
+    """Inverted index over the modules under a commands root"""
+
+    def __init__(self, root=COMMANDS_ROOT, directory=INDEX_DIR):
+        self.root = Path(root)
+        self.directory = directory
+        self.docs = {}          # module -> [doc_id, mtime_ns, size, segment]
+        self.segment_docs = {}  # segment -> documents assigned to it, with or without terms
+        self.segments = {}
+        self.next_doc_id = 0
+        self._refresh_live()
+        self._load()
+
+    def _manifest_path(self):
+        return os.path.join(self.directory, 'manifest.json')
+
+    def _load(self):
+        try:
+            with open(self._manifest_path(), 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (manifest.get('version') != INDEX_VERSION
+                or manifest.get('root') != str(self.root.resolve())
+                or manifest.get('byteorder') != sys.byteorder):
+            return
+        try:
+            for name in manifest['segments']:
+                self.segments[name] = Segment(self.directory, name)
+        except OSError:
+            self.close()
+            self.segments = {}
+            return
+        self.docs = manifest['docs']
+        self.segment_docs = manifest['segments']
+        self.next_doc_id = manifest['next_doc_id']
+        self._refresh_live()
+
+    def _refresh_live(self):
+        self.live = {entry[0]: module for module, entry in self.docs.items()}
+        self.doc_segment = {entry[0]: entry[3] for entry in self.docs.values()}
+        self.live_counts = defaultdict(int)
+        for name in self.doc_segment.values():
+            self.live_counts[name] += 1
+
+    def _save(self):
+        manifest = {
+            'version': INDEX_VERSION,
+            'root': str(self.root.resolve()),
+            'byteorder': sys.byteorder,
+            'next_doc_id': self.next_doc_id,
+            'segments': self.segment_docs,
+            'docs': self.docs,
+        }
+        tmp_path = f"{self._manifest_path()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+        os.replace(tmp_path, self._manifest_path())
+        # Remove segment files no longer referenced by the manifest
+        for entry in os.listdir(self.directory):
+            name = entry.split('.', 1)[0]
+            if name.startswith('seg-') and name not in self.segment_docs:
+                os.remove(os.path.join(self.directory, entry))
+
+    def module_paths(self):
+        """Yield every module under the root"""
+        for path in self.root.rglob('*.md'):
+            if not path.name.startswith('.'):
+                yield path.relative_to(self.root).as_posix()
+
+    def update(self, modules=None):
+        """Re-index changed modules; all of them, or only those given.
+
+        Returns the number of modules (re)indexed and removed.
+        """
+        if modules is None:
+            modules = set(self.module_paths()) | set(self.docs)
+        changed = []
+        removed = []
+        for module in modules:
+            try:
+                stat = os.stat(self.root / module)
+            except OSError:
+                if module in self.docs:
+                    removed.append(module)
+                continue
+            entry = self.docs.get(module)
+            if not entry or entry[1] != stat.st_mtime_ns or entry[2] != stat.st_size:
+                changed.append((module, stat))
+        if not changed and not removed:
+            return 0, 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        for module in removed:
+            del self.docs[module]
+        postings = defaultdict(dict)
+        name = f"seg-{self.next_doc_id:08d}"
+        assigned = 0
+        for module, stat in changed:
+            try:
+                with open(self.root / module, 'r') as f:
+                    terms = index_terms(f.read())
+            except (OSError, UnicodeDecodeError):
+                self.docs.pop(module, None)
+                continue
+            doc_id = self.next_doc_id
+            self.next_doc_id += 1
+            for term, positions in terms.items():
+                postings[term][doc_id] = positions
+            self.docs[module] = [doc_id, stat.st_mtime_ns, stat.st_size, name]
+            assigned += 1
+        if assigned:
+            # Modules without terms still count, or the segment would look
+            # fully live while one of its documents is superseded
+            write_segment(self.directory, name, postings)
+            self.segment_docs[name] = assigned
+            self.segments[name] = Segment(self.directory, name)
+
+        self._refresh_live()
+        self._drop_empty_segments()
+        if len(self.segments) > MAX_SEGMENTS or len(self.live) * 2 < sum(self.segment_docs.values()):
+            self.compact()
+        self._save()
+        return len(changed), len(removed)
+
+    def _drop_empty_segments(self):
+        used = set(self.doc_segment.values())
+        for name in [name for name in self.segments if name not in used]:
+            self.segments.pop(name).close()
+            del self.segment_docs[name]
+
+    def compact(self):
+        """Merge all segments into one, dropping dead documents"""
+        postings = defaultdict(dict)
+        for segment in self.segments.values():
+            for term in segment.terms:
+                doc_ids, offsets, positions = segment.postings(term)
+                for index, doc_id in enumerate(doc_ids):
+                    if self.doc_segment.get(doc_id) == segment.name:
+                        postings[term][doc_id] = positions[offsets[index]:offsets[index + 1]].tolist()
+        name = f"seg-{self.next_doc_id:08d}c"
+        self.close()
+        self.segments = {}
+        self.segment_docs = {}
+        if self.docs:
+            write_segment(self.directory, name, postings)
+            self.segment_docs[name] = len(self.docs)
+            self.segments[name] = Segment(self.directory, name)
+        for entry in self.docs.values():
+            entry[3] = name
+        self._refresh_live()
+
+    def close(self):
+        for segment in self.segments.values():
+            segment.close()
+
+    def documents(self, term):
+        """Live doc ids containing ``term``"""
+        found = set()
+        for segment in self.segments.values():
+            postings = segment.postings(term)
+            if postings is None:
+                continue
+            name = segment.name
+            if self.live_counts[name] == self.segment_docs[name]:
+                found.update(postings[0].tolist())
+            else:
+                found.update(doc_id for doc_id in postings[0].tolist()
+                             if self.doc_segment.get(doc_id) == name)
+        return found
+
+    def phrase_documents(self, doc_ids, tokens):
+        """The subset of ``doc_ids`` where ``tokens`` occur consecutively"""
+        by_segment = defaultdict(list)
+        for doc_id in doc_ids:
+            by_segment[self.doc_segment[doc_id]].append(doc_id)
+        found = set()
+        for name, candidates in by_segment.items():
+            postings = [self.segments[name].postings(token) for token in tokens]
+            if any(entry is None for entry in postings):
+                continue
+            for doc_id in candidates:
+                starts = None
+                for offset, (ids, offsets, positions) in enumerate(postings):
+                    index = bisect.bisect_left(ids, doc_id)
+                    if index == len(ids) or ids[index] != doc_id:
+                        starts = set()
+                        break
+                    shifted = {p - offset for p in positions[offsets[index]:offsets[index + 1]]}
+                    starts = shifted if starts is None else starts & shifted
+                    if not starts:
+                        break
+                if starts:
+                    found.add(doc_id)
+        return found
+
+    def search(self, query):
+        """Return the modules matching a query string, sorted"""
+        terms, phrases = parse_query(query)
+        result = None
+        for term in sorted(terms, key=len, reverse=True):
+            documents = self.documents(term)
+            result = documents if result is None else result & documents
+            if not result:
+                return []
+        if result is None:
+            result = set(self.live)
+        for tokens in phrases:
+            result = self.phrase_documents(result, tokens)
+        return sorted(self.live[doc_id] for doc_id in result)
+
+def parse_query(query):
+    """Split a query into required terms and multi-token phrases.
+
+    Double- or single-quoted text is a phrase. A query with unbalanced
+    quotes (e.g. ``don't``) is split on whitespace instead.
+    """
+    try:
+        parts = shlex.split(query)
+    except ValueError:
+        parts = query.split()
+    terms = set()
+    phrases = []
+    for part in parts:
+        field, sep, value = part.partition(':')
+        field = FIELD_ALIASES.get(field.lower(), field.lower())
+        if sep and field in FIELDS and value:
+            terms.add(f"{field}:{value.lower()}")
+            continue
+        tokens = tokenize(part)
+        terms.update(tokens)
+        if len(tokens) > 1:
+            phrases.append(tokens)
+    return terms, phrases
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip(), formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('query', nargs='*', help='words, "quoted phrases" and field:value filters')
+    parser.add_argument('--root', default=COMMANDS_ROOT,
+                        help=f'commands directory (default: {COMMANDS_ROOT})')
+    parser.add_argument('--index-dir', default=INDEX_DIR,
+                        help=f'index location (default: {INDEX_DIR})')
+    parser.add_argument('--no-update', action='store_true',
+                        help='query the index as it is, without checking for changes')
+    parser.add_argument('--compact', action='store_true',
+                        help='merge all segments into one')
+    args = parser.parse_args()
+
+    index = ModuleIndex(args.root, args.index_dir)
+    if not args.no_update:
+        start = time.perf_counter()
+        indexed, removed = index.update()
+        if indexed or removed:
+            print(f"Indexed {indexed} modules, removed {removed} "
+                  f"in {(time.perf_counter() - start) * 1000:.1f}ms", file=sys.stderr)
+    if args.compact and index.segments:
+        index.compact()
+        index._save()
+
+    if args.query:
+        # Each shell argument stays one part: a multi-word argument is a phrase
+        query = shlex.join(args.query)
+        start = time.perf_counter()
+        matches = index.search(query)
+        elapsed = time.perf_counter() - start
+        for module in matches:
+            print(module)
+        print(f"{len(matches)} modules in {elapsed * 1000:.3f}ms", file=sys.stderr)
+    index.close()
+
+if __name__ == "__main__":
+    main()
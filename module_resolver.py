@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Module Resolver - Assembles a command's modules into a single prompt on demand
+
+A command module pulls in other modules through its frontmatter
+``dependencies:`` and through ``!load <module>`` directives on their own
+line in the body. The resolver expands both, depth first, so dependencies
+come before the module that needs them. Every module appears at most once
+per assembly, so shared modules such as ``_shared.md``, ``_core.md`` and
+``_templates.md`` are not repeated. Parsed modules are kept in an LRU cache
+bounded by their size on disk.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import yaml
+
+from dependency_graph import COMMANDS_ROOT, candidate_paths
+from frontmatter_reader import parse_frontmatter, split_frontmatter
+
+# ``!load <module>`` alone on a line, outside fenced code blocks
+LOAD_DIRECTIVE = re.compile(r'^\s*!load\s+(\S+)\s*$')
+FENCE = re.compile(r'^\s*(```|~~~)')
+
+class ParsedModule:
+    """A module's declared dependencies and body, split at its directives"""
+
+    def __init__(self, content):
+        frontmatter, body = split_frontmatter(content)
+        self.dependencies = []
+        if frontmatter is not None:
+            try:
+                data = parse_frontmatter(frontmatter)
+            except yaml.YAMLError:
+                data = None
+            deps = data.get('dependencies') if isinstance(data, dict) else None
+            if isinstance(deps, list):
+                self.dependencies = [str(dep) for dep in deps if dep is not None]
+            elif deps:
+                self.dependencies = [str(deps)]
+
+        # Alternating text segments and ``!load`` targets: text, target, text, ...
+        self.segments = []
+        text = []
+        fenced = False
+        for line in body.splitlines(keepends=True):
+            if FENCE.match(line):
+                fenced = not fenced
+            directive = None if fenced else LOAD_DIRECTIVE.match(line)
+            if directive:
+                self.segments.append(''.join(text))
+                self.segments.append(directive.group(1))
+                text = []
+            else:
+                text.append(line)
+        self.segments.append(''.join(text))
+
+class ModuleCache:
+    """LRU cache of parsed modules, bounded by total file size in bytes.
+
+    Entries are revalidated against the file's mtime and size, so edits are
+    picked up by long-running callers.
+    """
+
+    def __init__(self, max_bytes=8 << 20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()   # path -> (mtime_ns, size, ParsedModule)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        """Return the parsed module at ``path``; raises OSError if unreadable"""
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self.entries.move_to_end(path)
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        with open(path, 'r') as f:
+            module = ParsedModule(f.read())
+        self._discard(path)
+        if stat.st_size <= self.max_bytes:
+            self.entries[path] = (stat.st_mtime_ns, stat.st_size, module)
+            self.total_bytes += stat.st_size
+            while self.total_bytes > self.max_bytes:
+                self._discard(next(iter(self.entries)))
+        return module
+
+    def _discard(self, path):
+        entry = self.entries.pop(path, None)
+        if entry:
+            self.total_bytes -= entry[1]
+
+class Assembly:
+    """An assembled command prompt and what went into it"""
+
+    def __init__(self, command, text, modules, missing, seconds):
+        self.command = command
+        self.text = text
+        self.modules = modules
+        self.missing = missing
+        self.seconds = seconds
+
+    @property
+    def size(self):
+        return len(self.text.encode())
+
+class ModuleResolver:
+    """Resolves and assembles modules under a commands root"""
+
+    def __init__(self, root=COMMANDS_ROOT, cache=None):
+        self.root = Path(root)
+        self.cache = cache if cache is not None else ModuleCache()
+
+    def _find(self, module, reference):
+        """Resolve a reference made by ``module``, or None if missing"""
+        for candidate in candidate_paths(module, reference):
+            if (self.root / candidate).is_file():
+                return candidate
+        return None
+
+    def assemble(self, command):
+        """Expand a command module into a single prompt"""
+        start = time.perf_counter()
+        parts = []
+        included = []
+        missing = []
+        seen = set()
+
+        # Iterative depth-first expansion; each frame walks one module's
+        # dependencies, then its body segments.
+        def enter(module):
+            seen.add(module)
+            parsed = self.cache.get(self.root / module)
+            return [module, parsed, 0, 0]
+
+        def require(module, reference):
+            target = self._find(module, reference)
+            if target is None:
+                missing.append((module, reference))
+                return False
+            if target not in seen:
+                stack.append(enter(target))
+            return True
+
+        stack = [enter(command)]
+        while stack:
+            frame = stack[-1]
+            module, parsed, dep_index, segment_index = frame
+            if dep_index < len(parsed.dependencies):
+                frame[2] += 1
+                require(module, parsed.dependencies[dep_index])
+                continue
+            if segment_index == 0:
+                parts.append(f"<!-- module: {module} -->\n")
+            if segment_index < len(parsed.segments):
+                frame[3] += 1
+                if segment_index % 2:
+                    reference = parsed.segments[segment_index]
+                    if not require(module, reference):
+                        # Leave unresolved directives in place
+                        parts.append(f"!load {reference}\n")
+                else:
+                    parts.append(parsed.segments[segment_index])
+                continue
+            included.append(module)
+            stack.pop()
+
+        return Assembly(command, ''.join(parts), included, missing,
+                        time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('commands', nargs='+', metavar='MODULE',
+                        help='command module relative to the root, e.g. report/bug.md')
+    parser.add_argument('--root', default=COMMANDS_ROOT,
+                        help=f'commands directory (default: {COMMANDS_ROOT})')
+    parser.add_argument('--stats', action='store_true',
+                        help='report assembled size and load time instead of the prompt')
+    args = parser.parse_args()
+
+    resolver = ModuleResolver(args.root)
+    errors = 0
+    for command in args.commands:
+        try:
+            assembly = resolver.assemble(command)
+        except OSError as e:
+            print(f"❌ {command}: {e}", file=sys.stderr)
+            errors += 1
+            continue
+        for module, reference in assembly.missing:
+            print(f"❌ {module} → Missing module: {reference}", file=sys.stderr)
+        errors += len(assembly.missing)
+        if args.stats:
+            print(f"{command}: {len(assembly.modules)} modules, "
+                  f"{assembly.size} bytes, {assembly.seconds * 1000:.2f}ms")
+        else:
+            sys.stdout.write(assembly.text)
+
+    if args.stats:
+        print(f"Module cache: {resolver.cache.hits} hits, {resolver.cache.misses} misses, "
+              f"{resolver.cache.total_bytes} bytes")
+    sys.exit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()
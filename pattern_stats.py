@@ -0,0 +1,155 @@
+"""
+Pattern Stats - Aggregates pattern matches across files with bounded memory
+
+``PatternStats`` collects per-category match counts for analyze-patterns.py.
+Match keys can be normalized (whitespace collapsed) and are interned, so
+the same text is stored once however many files produce it. In top-k mode
+each category keeps a fixed number of counters using the Space-Saving
+algorithm, so memory stays flat however large the corpus. Optional per-file
+attribution stores file ids in ``array('I')`` postings against a single
+file table instead of repeating path strings.
+"""
+
+import heapq
+import sys
+from array import array
+from collections import Counter, defaultdict
+
+def normalize_match(match):
+    """Collapse whitespace runs in a match (or each part of a tuple match)"""
+    if isinstance(match, tuple):
+        return tuple(' '.join(part.split()) for part in match)
+    return ' '.join(match.split())
+
+class SpaceSaving:
+    """Approximate heavy-hitter counter holding at most ``capacity`` keys.
+
+    Any key whose true count exceeds total / capacity is guaranteed to be
+    tracked. Reported counts overestimate the true count by at most
+    ``error(key)``. Supports the parts of the Counter interface used by
+    reports: ``update``, ``most_common``, ``items``, ``values`` and ``len``.
+    """
+
+    approximate = True
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self._heap = []   # (count, key) entries, stale ones skipped lazily
+        self.total = 0
+
+    def update(self, counts):
+        """Add a mapping of key -> count, or an iterable of keys"""
+        items = counts.items() if hasattr(counts, 'items') else ((key, 1) for key in counts)
+        for key, count in items:
+            self.add(key, count)
+
+    def add(self, key, count=1):
+        self.total += count
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+        else:
+            # Replace the minimum key; the newcomer inherits its count as error
+            minimum, evicted = self._pop_minimum()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[key] = minimum + count
+            self.errors[key] = minimum
+        heapq.heappush(self._heap, (self.counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, k) for k, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_minimum(self):
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return count, key
+
+    def error(self, key):
+        return self.errors.get(key, 0)
+
+    def most_common(self, n=None):
+        ordered = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return ordered if n is None else ordered[:n]
+
+    def items(self):
+        return self.counts.items()
+
+    def values(self):
+        return self.counts.values()
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __getitem__(self, key):
+        return self.counts.get(key, 0)
+
+class PatternStats:
+    """Per-category match counts, exact or top-k, with optional attribution"""
+
+    def __init__(self, normalize=False, top_k=None, attribute=False):
+        self.normalize = normalize
+        self.top_k = top_k
+        self.attribute = attribute
+        self.counters = {}
+        self.files = []                 # file id -> path
+        self.postings = defaultdict(dict)   # category -> key -> array of file ids
+
+    def _counter(self, category):
+        counter = self.counters.get(category)
+        if counter is None:
+            counter = SpaceSaving(self.top_k) if self.top_k else Counter()
+            self.counters[category] = counter
+        return counter
+
+    def _key(self, match):
+        if self.normalize:
+            match = normalize_match(match)
+        # sys.intern keeps one copy per distinct text while anything refers to it
+        if isinstance(match, tuple):
+            return tuple(sys.intern(part) for part in match)
+        return sys.intern(match)
+
+    def add(self, counts, filepath=None):
+        """Merge one file's (or batch's) ``{category: Counter}``"""
+        file_id = None
+        if self.attribute and filepath is not None:
+            file_id = len(self.files)
+            self.files.append(filepath)
+        for category, matches in counts.items():
+            if file_id is None and not self.normalize and not self.top_k:
+                self._counter(category).update(matches)
+                continue
+            merged = Counter()
+            for match, count in matches.items():
+                merged[self._key(match)] += count
+            self._counter(category).update(merged)
+            if file_id is not None:
+                postings = self.postings[category]
+                for key in merged:
+                    postings.setdefault(key, array('I')).append(file_id)
+        if self.top_k and file_id is not None:
+            self._prune_postings()
+
+    def _prune_postings(self):
+        """Drop attribution for keys a top-k counter has evicted"""
+        for category, postings in self.postings.items():
+            if len(postings) > 2 * self.top_k:
+                tracked = self.counters[category].counts
+                for key in [key for key in postings if key not in tracked]:
+                    del postings[key]
+
+    def results(self):
+        """``{category: counter}`` for generate_report and friends"""
+        return self.counters
+
+    def attribution(self, category, key):
+        """Paths of the files a pattern was seen in (tracked keys only)"""
+        return [self.files[file_id] for file_id in self.postings[category].get(key, ())]
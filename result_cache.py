@@ -0,0 +1,149 @@
+"""
+Result Cache - Persistent per-file results keyed by path, stat and content hash
+
+Used by analyze-patterns.py and validate-yaml-frontmatter.py so that a run
+only recomputes files that changed since the previous one.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+CACHE_DIR = '.claude/cache'
+
+# Stat data is only trusted once the file's mtime is this far older than the
+# moment it was hashed; edits within the same timestamp tick are re-hashed.
+RACY_WINDOW_NS = 2 * 10**9
+
+def file_digest(filepath):
+    """Return a content hash for a file"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ResultCache:
+    """On-disk map of file path to a JSON-serializable result.
+
+    An entry is valid while the file's mtime and size match. When they
+    differ, the content hash decides: an unchanged hash refreshes the stat
+    data and keeps the result. ``fingerprint`` identifies the producer of
+    the results (e.g. a pattern table); a different fingerprint discards
+    the whole cache.
+
+    A miss in ``get`` stamps the file's stat data and hash before the caller
+    reads it, and ``put`` stores the result under that stamp, so an edit
+    made while the result is computed is seen as a change on the next run.
+    """
+
+    def __init__(self, name, fingerprint, cache_dir=CACHE_DIR):
+        self.path = os.path.join(cache_dir, f"{name}.json")
+        self.fingerprint = fingerprint
+        self.entries = {}
+        self.stamps = {}    # path -> (stat, digest, checked_ns) of a pending miss
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('fingerprint') == fingerprint:
+                self.entries = data['entries']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def get(self, filepath):
+        """Return the cached result for a file, or None if it is stale"""
+        key = os.path.abspath(filepath)
+        self.seen.add(key)
+        self.stamps.pop(key, None)
+        entry = self.entries.get(key)
+        checked_ns = time.time_ns()
+        try:
+            stat = os.stat(key)
+        except OSError:
+            self.misses += 1
+            return None
+
+        if (entry is not None
+                and entry['mtime_ns'] == stat.st_mtime_ns
+                and entry['size'] == stat.st_size
+                and entry['checked_ns'] - entry['mtime_ns'] > RACY_WINDOW_NS):
+            self.hits += 1
+            return entry['value']
+
+        try:
+            digest = file_digest(key)
+        except OSError:
+            self.misses += 1
+            return None
+        if entry is not None and entry['size'] == stat.st_size and entry['digest'] == digest:
+            self._store(key, stat, digest, checked_ns, entry['value'])
+            self.hits += 1
+            return entry['value']
+
+        self.stamps[key] = (stat, digest, checked_ns)
+        self.misses += 1
+        return None
+
+    def put(self, filepath, value):
+        """Record the result computed for a file after ``get`` missed it.
+
+        The result is stored under the stat data and hash taken by that
+        ``get``, before the file was read. Without one, the file is stamped
+        now, which misses edits made while the result was computed.
+        """
+        key = os.path.abspath(filepath)
+        self.seen.add(key)
+        stamp = self.stamps.pop(key, None)
+        if stamp is None:
+            try:
+                stamp = (os.stat(key), file_digest(key), time.time_ns())
+            except OSError:
+                self.entries.pop(key, None)
+                return
+        self._store(key, *stamp, value)
+
+    def _store(self, key, stat, digest, checked_ns, value):
+        self.entries[key] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'checked_ns': checked_ns,
+            'digest': digest,
+            'value': value,
+        }
+        self.dirty = True
+
+    def evict(self):
+        """Drop entries for files that no longer exist"""
+        stale = [key for key in self.entries
+                 if key not in self.seen and not os.path.exists(key)]
+        for key in stale:
+            del self.entries[key]
+        self.dirty = self.dirty or bool(stale)
+        return len(stale)
+
+    def save(self):
+        """Evict stale entries and write the cache atomically"""
+        self.evict()
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'fingerprint': self.fingerprint, 'entries': self.entries},
+                      f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def clear(self):
+        """Remove all entries and the cache file"""
+        self.entries = {}
+        self.dirty = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
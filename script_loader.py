@@ -0,0 +1,24 @@
+"""
+Script Loader - Imports the repository's hyphenated scripts as modules
+
+Scripts such as analyze-patterns.py cannot be imported by name. They are
+registered in sys.modules under a snake_case name (``analyze_patterns``),
+so objects defined in them can be pickled for worker processes.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+def load_script(filename):
+    """Import one of the repository's hyphenated scripts as a module"""
+    name = Path(filename).stem.replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
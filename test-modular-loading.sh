@@ -153,6 +153,156 @@ else
 fi
 ((test_count++))
 
+# Test 10: Resolve and assemble command modules
+echo -e "\n📋 Test: Module assembly via !load and dependencies"
+commands=$(cd .claude/commands 2>/dev/null && find command plan report -maxdepth 1 -name "[!_]*.md" -type f 2>/dev/null)
+if [ -n "$commands" ] && python3 module_resolver.py --stats $commands; then
+    echo -e "${GREEN}✅ PASS${NC}"
+    ((pass_count++))
+else
+    echo -e "${RED}❌ FAIL${NC} - Unresolved modules"
+fi
+((test_count++))
+
+# Test 11: Incremental dependency graph updates match a fresh build
+echo -e "\n📋 Test: Incremental dependency graph updates"
+if python3 - <<'EOF'
+import random
+import tempfile
+from pathlib import Path
+
+from dependency_graph import DependencyGraph
+
+def snapshot(graph):
+    return (graph.edges, graph.missing,
+            {module: users for module, users in graph.reverse.items() if users},
+            sorted(graph.cycles()))
+
+rng = random.Random(0)
+names = ['a.md', 'b.md', 'c.md', 'x/a.md', 'x/b.md', 'x/y/c.md', 'templates/t.md']
+with tempfile.TemporaryDirectory() as root:
+    graph = DependencyGraph(root).build()
+    for step in range(2000):
+        module = rng.choice(names)
+        path = Path(root) / module
+        if path.exists() and rng.random() < 0.3:
+            path.unlink()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            deps = rng.sample(names + ['../a.md', 'y/c.md', 'gone.md'], rng.randint(0, 3))
+            path.write_text('---\ndependencies:\n' + ''.join(f'  - {dep}\n' for dep in deps)
+                            + '---\n')
+        if module.startswith('templates/'):
+            continue
+        graph.update(module)
+        fresh = DependencyGraph(root).build()
+        if snapshot(graph) != snapshot(fresh):
+            raise SystemExit(f"Graph diverged from a fresh build at step {step} ({module})")
+print("2000 random edits: incremental graph matches a fresh build")
+EOF
+then
+    echo -e "${GREEN}✅ PASS${NC}"
+    ((pass_count++))
+else
+    echo -e "${RED}❌ FAIL${NC} - Incremental graph diverged"
+fi
+((test_count++))
+
+# Test 12: Incremental index updates answer queries like a fresh index
+echo -e "\n📋 Test: Incremental module index updates"
+if python3 - <<'EOF'
+import os
+import random
+import tempfile
+from pathlib import Path
+
+from module_index import ModuleIndex
+
+rng = random.Random(0)
+names = ['a.md', 'b.md', 'c.md', 'e.md', 'x/a.md', 'x/y/b.md']
+words = ['alpha', 'beta', 'gamma', 'delta']
+queries = words + ['"alpha beta"', 'scope:core', 'alpha scope:core']
+with tempfile.TemporaryDirectory() as tmp:
+    root = Path(tmp) / 'commands'
+    index = ModuleIndex(root, os.path.join(tmp, 'index'))
+    for step in range(500):
+        # Several edits per update, so segments hold live and superseded documents
+        edited = rng.sample(names, rng.randint(1, 3))
+        for module in edited:
+            path = root / module
+            if path.exists() and rng.random() < 0.2:
+                path.unlink()
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Empty and term-less modules still take a document id
+                content = rng.choice(['', '---\n---\n',
+                                      '---\nscope: core\n---\n',
+                                      ' '.join(rng.choices(words, k=rng.randint(1, 4)))])
+                # Vary the size so the change is seen whatever the mtime resolution
+                path.write_text(content + ' ' * step)
+        index.update(edited if rng.random() < 0.5 else None)
+        fresh = ModuleIndex(root, os.path.join(tmp, f'fresh-{step}'))
+        fresh.update()
+        for query in queries:
+            if index.search(query) != fresh.search(query):
+                raise SystemExit(f"Index diverged from a fresh build at step {step} ({query})")
+        fresh.close()
+    index.close()
+print("500 random edits: incremental index matches a fresh build")
+EOF
+then
+    echo -e "${GREEN}✅ PASS${NC}"
+    ((pass_count++))
+else
+    echo -e "${RED}❌ FAIL${NC} - Incremental index diverged"
+fi
+((test_count++))
+
+# Test 13: Chunked pattern scans match whole-file scans
+echo -e "\n📋 Test: Streamed pattern matching"
+if python3 - <<'EOF'
+import io
+import random
+import tempfile
+
+from script_loader import load_script
+
+patterns = load_script('analyze-patterns.py')
+rng = random.Random(0)
+fragments = ['git', 'status', 'branch', '-r', 'echo "Error"', '>&2', 'exit 1', '!load x.md',
+             'source lib.sh', 'validate_it(', '-f $file', ' ', '\n', '\n\n\n']
+for strategy in patterns.PatternMatcher.STRATEGIES:
+    matcher = patterns.PatternMatcher(patterns.PatternAnalyzer().patterns, strategy)
+    for trial in range(300):
+        content = ''.join(rng.choices(fragments, k=rng.randint(0, 300)))
+        # Matches can span lines (\s+ takes newlines); give each trial an
+        # overlap no shorter than its longest match
+        longest = max((len(m.group()) for rx in matcher.compiled
+                       for m in rx.finditer(content)), default=0)
+        overlap = longest + rng.randint(0, 40)
+        chunk_size = rng.randint(1, 60)
+        if matcher.scan_stream(io.StringIO(content), chunk_size, overlap) != matcher.scan(content):
+            raise SystemExit(f"{strategy}: stream scan differs (trial {trial}, "
+                             f"chunk {chunk_size}, overlap {overlap})")
+
+# A single match longer than a chunk but within the default overlap
+analyzer = patterns.PatternAnalyzer(stream_threshold=0, chunk_size=1 << 10)
+content = 'git' + '\n' * 40000 + 'status\n'
+with tempfile.NamedTemporaryFile('w', suffix='.md') as f:
+    f.write(content)
+    f.flush()
+    if analyzer.analyze_file(f.name) != analyzer.analyze_content(content):
+        raise SystemExit("Streamed file lost a match longer than a chunk")
+print("600 random texts: chunked scans match whole-file scans")
+EOF
+then
+    echo -e "${GREEN}✅ PASS${NC}"
+    ((pass_count++))
+else
+    echo -e "${RED}❌ FAIL${NC} - Streamed matches differ"
+fi
+((test_count++))
+
 # Summary
 echo -e "\n========================================"
 echo "Test Summary:"
@@ -1,47 +1,59 @@
 #!/usr/bin/env python3
 """Validate YAML frontmatter in all markdown files."""
 
+import argparse
 import os
 import sys
 import yaml
 from pathlib import Path
 
-def validate_yaml_frontmatter(file_path):
-    """Validate YAML frontmatter in a markdown file."""
+from frontmatter_reader import (REQUIRED_FIELDS, FrontmatterError, missing_fields,
+                                parse_frontmatter, read_frontmatter)
+from result_cache import ResultCache
+
+# Bump when validation rules change so cached verdicts are discarded
+VALIDATOR_VERSION = 2
+
+def validate_yaml_frontmatter(file_path, fast=True):
+    """Validate YAML frontmatter in a markdown file.
+    
+    Only the frontmatter is read. With ``fast``, simple frontmatter is
+    checked without a YAML parse; see frontmatter_reader.scan_frontmatter.
+    """
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-            
-        if not content.startswith('---'):
-            return False, "No YAML frontmatter found"
-            
-        # Extract frontmatter
-        parts = content.split('---', 2)
-        if len(parts) < 3:
-            return False, "Invalid frontmatter format"
-            
-        frontmatter = parts[1]
-        
-        try:
-            data = yaml.safe_load(frontmatter)
-            
-            # Check required fields
-            required_fields = ['module', 'scope', 'priority']
-            missing = [field for field in required_fields if field not in data]
-            
-            if missing:
-                return False, f"Missing required fields: {', '.join(missing)}"
-                
-            return True, "Valid"
-            
-        except yaml.YAMLError as e:
-            return False, f"YAML parsing error: {str(e)}"
-            
+        frontmatter = read_frontmatter(file_path)
+    except FrontmatterError as e:
+        return False, str(e)
     except Exception as e:
         return False, f"Error reading file: {str(e)}"
+        
+    try:
+        data = parse_frontmatter(frontmatter, fast)
+    except yaml.YAMLError as e:
+        return False, f"YAML parsing error: {str(e)}"
+        
+    if not isinstance(data, dict):
+        return False, "Frontmatter is not a mapping"
+        
+    # Check required fields
+    missing = missing_fields(data, REQUIRED_FIELDS)
+    
+    if missing:
+        return False, f"Missing required fields: {', '.join(missing)}"
+        
+    return True, "Valid"
 
 def main():
     """Main function to validate all markdown files."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--no-cache', action='store_true',
+                        help='ignore and do not update .claude/cache/')
+    parser.add_argument('--full-yaml', action='store_true',
+                        help='always parse frontmatter with YAML')
+    args = parser.parse_args()
+    
+    cache = None if args.no_cache else ResultCache(
+        'validate-yaml-frontmatter', VALIDATOR_VERSION)
     base_path = Path('.claude/commands')
     total_files = 0
     valid_files = 0
@@ -55,7 +67,12 @@ def main():
             continue
             
         total_files += 1
-        is_valid, message = validate_yaml_frontmatter(md_file)
+        verdict = cache.get(md_file) if cache else None
+        if verdict is None:
+            verdict = validate_yaml_frontmatter(md_file, not args.full_yaml)
+            if cache:
+                cache.put(md_file, verdict)
+        is_valid, message = verdict
         
         if is_valid:
             valid_files += 1
@@ -64,6 +81,9 @@ def main():
             invalid_files.append((md_file, message))
             print(f"❌ {md_file.relative_to('.')}: {message}")
     
+    if cache:
+        cache.save()
+    
     print("\n" + "=" * 50)
     print(f"Total files checked: {total_files}")
     print(f"Valid files: {valid_files}")